@@ -1 +1,2 @@
 from .lab import PoisonedDrinksLaboratory, PoisonedDrinksSolver, PoisonedDrinksExperiment
+from .experiment import PoisonedDrinksExperimentBatch
@@ -1,5 +1,5 @@
 import numpy as np
-from typing import Iterable
+from typing import Optional
 
 
 class PoisonedDrinksExperiment:
@@ -10,13 +10,50 @@ class PoisonedDrinksExperiment:
         self.num_glasses = num_glasses
         self.poison_chance = poison_chance
         # Poison some glasses... 0 is healthy, 1 is poisoned.
-        np.random.seed(seed)
-        self.__glasses = (np.random.random([num_glasses]) <= poison_chance) * 1
+        # Uses a local generator so experiments don't touch (or depend on) the global NumPy random state.
+        rng = np.random.default_rng(seed)
+        self.__glasses = (rng.random(num_glasses) <= poison_chance).astype(np.int32)
+        # Prefix sums of the poisoned glasses, so any contiguous group can be checked in O(1).
+        self.__cum = np.zeros(num_glasses + 1, dtype=np.int32)
+        np.cumsum(self.__glasses, out=self.__cum[1:])
 
-    def check_poison(self, glasses_indices: Iterable[int]) -> bool:
-        """ Checks whether a group of glasses are poisoned. """
-        return np.any(self.__glasses[glasses_indices])
+    def check_poison(self, i_start: int, i_end: Optional[int] = None) -> bool:
+        """ Checks whether a group of glasses [i_start, i_end) are poisoned.
+            If i_end is not given, only checks the single glass i_start. """
+        if i_end is None:
+            return bool(self.__glasses[i_start])
+        return bool(self.__cum[i_end] > self.__cum[i_start])
 
     def check_solution(self, solution: np.array) -> bool:
         """ Checks whether a found solution to the experiment is correct. """
-        return np.all(self.__glasses == solution)
+        return np.array_equal(self.__glasses, solution)
+
+
+class PoisonedDrinksExperimentBatch:
+    """ A batch of independent experiments of the poisoned drinks problem, sharing the same parameters.
+        Each poison check is answered for all the trials at once, one value per trial. """
+
+    def __init__(self, num_trials: int, num_glasses: int, poison_chance: float, seed: int = 0):
+        """ Creates a batch of instances of the poisoned drinks problem.
+            Trial i has the same glasses as PoisonedDrinksExperiment(seed=seed + i). """
+        self.num_trials = num_trials
+        self.num_glasses = num_glasses
+        self.poison_chance = poison_chance
+        # Poison some glasses... each row is a trial, 0 is healthy, 1 is poisoned.
+        self.__glasses = np.empty([num_trials, num_glasses], dtype=np.int32)
+        for i in range(num_trials):
+            self.__glasses[i] = np.random.default_rng(seed + i).random(num_glasses) <= poison_chance
+        # Prefix sums of the poisoned glasses of each trial, so any contiguous group can be checked in O(1).
+        self.__cum = np.zeros([num_trials, num_glasses + 1], dtype=np.int32)
+        np.cumsum(self.__glasses, axis=1, out=self.__cum[:, 1:])
+
+    def check_poison(self, i_start: int, i_end: Optional[int] = None) -> np.ndarray:
+        """ Checks, for each trial, whether a group of glasses [i_start, i_end) are poisoned.
+            If i_end is not given, only checks the single glass i_start. """
+        if i_end is None:
+            return self.__glasses[:, i_start] > 0
+        return self.__cum[:, i_end] > self.__cum[:, i_start]
+
+    def check_solution(self, solutions: np.ndarray) -> np.ndarray:
+        """ Checks, for each trial, whether a found solution (a row of solutions) is correct. """
+        return np.all(self.__glasses == solutions, axis=1)
@@ -5,7 +5,7 @@ import pandas as pd
 import mlflow
 from tqdm import tqdm
 
-from poison.experiment import PoisonedDrinksExperiment
+from poison.experiment import PoisonedDrinksExperiment, PoisonedDrinksExperimentBatch
 from poison.solvers.base import PoisonedDrinksSolver
 
 
@@ -30,6 +30,8 @@ class PoisonedDrinksLaboratory:
             (p, [PoisonedDrinksExperiment(num_glasses=self.num_glasses, poison_chance=p, seed=seed + i)
                  for i in range(self.num_experiments)])
             for p in self.poison_chance_values])
+        # The same experiments as batches, created on demand for solvers that can solve all of them at once.
+        self.experiment_batches = dict()
         self.solver_results = dict()
         # Create the MLFlow experiment record.
         experiment_name = "Poisoned Drinks"
@@ -50,14 +52,29 @@ class PoisonedDrinksLaboratory:
                 solver_name=solver.name,
                 poison_percentage=str(np.round(poison_chance * 100, 2)).rjust(5))
             # Solve all the experiments associated with the poison probability using the solver.
-            self.solver_results[solver.name][poison_chance] = []
-            for i in tqdm(range(self.num_experiments), desc=status_description_string):
-                solver.load_experiment(experiment=self.experiments[poison_chance][i])
-                solver.solve()
-                self.solver_results[solver.name][poison_chance].append(solver.num_tests)
+            if solver.supports_batch:
+                with tqdm(total=self.num_experiments, desc=status_description_string) as progress:
+                    self.solver_results[solver.name][poison_chance] = \
+                        solver.solve_batch(batch=self._get_batch(poison_chance)).tolist()
+                    progress.update(self.num_experiments)
+            else:
+                self.solver_results[solver.name][poison_chance] = []
+                for i in tqdm(range(self.num_experiments), desc=status_description_string):
+                    solver.load_experiment(experiment=self.experiments[poison_chance][i])
+                    solver.solve()
+                    self.solver_results[solver.name][poison_chance].append(solver.num_tests)
         # Logs the results of the solver.
         self.log_results(solver=solver)
 
+    def _get_batch(self, poison_chance: float) -> PoisonedDrinksExperimentBatch:
+        """ Gets the experiments of the given poison probability as a batch, creating it on first use.
+            Trial i of the batch has the same glasses as the i-th experiment of that probability. """
+        if poison_chance not in self.experiment_batches:
+            self.experiment_batches[poison_chance] = PoisonedDrinksExperimentBatch(
+                num_trials=self.num_experiments, num_glasses=self.num_glasses,
+                poison_chance=poison_chance, seed=self.seed)
+        return self.experiment_batches[poison_chance]
+
     def log_results(self, solver: PoisonedDrinksSolver) -> None:
         with mlflow.start_run(experiment_id=self.mlflow_experiment.experiment_id, run_name=solver.name) as active_run:
             mlflow.log_params(solver.params)
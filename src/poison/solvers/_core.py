@@ -1,7 +1,10 @@
-from typing import Callable, Dict
+from typing import Callable, Dict, Tuple
+
+import numpy as np
 
 from .base import PoisonedDrinksSolver
-from poison.solvers.strategy import PoisonedGroupStrategies
+from poison.experiment import PoisonedDrinksExperimentBatch
+from poison.solvers.strategy import PoisonedGroupStrategies, PoisonedGroupSplitStrategies
 
 
 class SolverTwoLevels(PoisonedDrinksSolver):
@@ -26,11 +29,32 @@ class SolverTwoLevels(PoisonedDrinksSolver):
         # Determine the group size according the minimum expected tests.
         top_level_group_size = self.top_group_strategy(n=self.n, p=self.p)
         # Check each group [i_start, i_end) to see if one glass in it is poisoned.
-        for i_start in range(0, super().n, top_level_group_size):
-            i_end = min([i_start + top_level_group_size, super().n])
-            if super().check_for_poison(range(i_start, i_end)):
+        n = self.n
+        check_for_poison = self.check_for_poison
+        for i_start in range(0, n, top_level_group_size):
+            i_end = min(i_start + top_level_group_size, n)
+            if check_for_poison(i_start, i_end):
                 self.poisoned_group_strategy(solver=self, i_start=i_start, i_end=i_end)
 
+    @property
+    def supports_batch(self) -> bool:
+        return hasattr(self.poisoned_group_strategy, "batch_strategy")
+
+    def _solve_batch_core(self, batch: PoisonedDrinksExperimentBatch) -> Tuple[np.ndarray, np.ndarray]:
+        n = batch.num_glasses
+        num_tests = np.zeros(batch.num_trials, dtype=int)
+        solutions = np.zeros([batch.num_trials, n], dtype=np.uint8)
+        # Determine the group size according the minimum expected tests.
+        top_level_group_size = self.top_group_strategy(n=n, p=batch.poison_chance)
+        # Check each group [i_start, i_end) of all the trials to see if one glass in it is poisoned.
+        for i_start in range(0, n, top_level_group_size):
+            i_end = min(i_start + top_level_group_size, n)
+            num_tests += 1
+            self.poisoned_group_strategy.batch_strategy(
+                batch=batch, poisoned=batch.check_poison(i_start, i_end), i_start=i_start, i_end=i_end,
+                num_tests=num_tests, solutions=solutions)
+        return num_tests, solutions
+
 
 class SolverDeepDive(SolverTwoLevels):
     """
@@ -58,17 +82,24 @@ class SolverDeepDive(SolverTwoLevels):
         elif (i_end - i_start) > 1:
             # If we don't know, we split the search. This is under the assumption, that in most time,
             # we will only dive into one subset of the search space.
-            i_split = solver.poisoned_group_split_strategy(i_start=i_start, i_end=i_end, p=solver.p)
+            split_strategy = solver.poisoned_group_split_strategy
+            # Splitting in the middle is common enough to be computed inline, saving a call per split.
+            if split_strategy is PoisonedGroupSplitStrategies.middle:
+                i_split = (i_start + i_end) // 2
+            else:
+                i_split = split_strategy(i_start=i_start, i_end=i_end, p=solver.p)
             # If we couldn't find a split point, perform Round-robin+.
             if not i_split:
                 PoisonedGroupStrategies.round_robin_plus(solver=solver, i_start=i_start, i_end=i_end)
             else:
                 # We first check if there's poison in the left half.
-                found_poison_left = solver.check_for_poison(range(i_start, i_split))
-                if found_poison_left:
+                if solver.check_for_poison(i_start, i_split):
                     SolverDeepDive._deep_dive_poisoned_group(solver=solver, i_start=i_start, i_end=i_split)
-                # If there's still a chance there's poison in the right half, we have to check it as well.
-                if not found_poison_left or solver.check_for_poison(range(i_split, i_end)):
+                    # There's still a chance there's poison in the right half, so we have to check it as well.
+                    if solver.check_for_poison(i_split, i_end):
+                        SolverDeepDive._deep_dive_poisoned_group(solver=solver, i_start=i_split, i_end=i_end)
+                else:
+                    # The group has at least one poisoned glass, so it has to be in the right half.
                     SolverDeepDive._deep_dive_poisoned_group(solver=solver, i_start=i_split, i_end=i_end)
 
 
@@ -89,10 +120,12 @@ class SolverEarlyStop(PoisonedDrinksSolver):
         # Determine the group size according the minimum expected tests.
         top_level_group_size = self.top_group_strategy(n=self.n, p=self.p)
         # Check each group [i_start, i_end) to see if one glass in it is poisoned.
+        n = self.n
+        check_for_poison = self.check_for_poison
         i_start = 0
-        while i_start < super().n:
-            i_end = min([i_start + top_level_group_size, super().n])
-            if super().check_for_poison(range(i_start, i_end)):
+        while i_start < n:
+            i_end = min(i_start + top_level_group_size, n)
+            if check_for_poison(i_start, i_end):
                 # If found poison, we should continue with the glass right after the poisoned one.
                 i_end = self._early_stop_deep_dive_poisoned_group(i_start=i_start, i_end=i_end) + 1
             i_start = i_end
@@ -100,31 +133,35 @@ class SolverEarlyStop(PoisonedDrinksSolver):
     def _early_stop_deep_dive_poisoned_group(self, i_start: int, i_end: int) -> int:
         """ Deep diving into a group of drinks knowing that there's at least one poisoned drink.
             Stops once we have found the first poisoned drink, and returns its location. """
-        # If there is only one glass, it has to contain poison.
-        if (i_end - i_start) == 1:
-            super().mark_as_poison(i_start)
-            return i_start
-        if (i_end - i_start) > 1:
+        check_for_poison = self.check_for_poison
+        split_strategy = self.poisoned_group_split_strategy
+        split_in_middle = split_strategy is PoisonedGroupSplitStrategies.middle
+        # We only ever dive into one half of the group, so the search is a loop narrowing [i_start, i_end).
+        while (i_end - i_start) > 1:
             # If we don't know, we split the search. This is under the assumption, that in most time,
             # we will only dive into one subset of the search space.
-            i_split = self.poisoned_group_split_strategy(i_start=i_start, i_end=i_end, p=self.p)
+            if split_in_middle:
+                i_split = (i_start + i_end) // 2
+            else:
+                i_split = split_strategy(i_start=i_start, i_end=i_end, p=self.p)
             if not i_split:
                 return self._early_stop_round_robin_plus(i_start=i_start, i_end=i_end)
+            # We first check if there's poison in the left half.
+            if check_for_poison(i_start, i_split):
+                i_end = i_split
             else:
-                # We first check if there's poison in the left half.
-                found_poison_left = super().check_for_poison(range(i_start, i_split))
-                if found_poison_left:
-                    return self._early_stop_deep_dive_poisoned_group(i_start=i_start, i_end=i_split)
-                # If there's still a chance there's poison in the right half, we have to check it as well.
-                if not found_poison_left or super().check_for_poison(range(i_split, i_end)):
-                    return self._early_stop_deep_dive_poisoned_group(i_start=i_split, i_end=i_end)
+                # The group has at least one poisoned glass, so it has to be in the right half.
+                i_start = i_split
+        # If there is only one glass, it has to contain poison.
+        self.mark_as_poison(i_start)
+        return i_start
 
     def _early_stop_round_robin_plus(self, i_start: int, i_end: int) -> int:
         """ Greedy round robin marks the last glass as poisoned if all previous glasses were not poisoned. """
         # If found poison in group element, check each individual glass in the group.
         last_poison_index = None
         for i in range(i_start, i_end):
-            if (last_poison_index is None and i == (i_end - 1)) or self.check_for_poison([i]):
+            if (last_poison_index is None and i == (i_end - 1)) or self.check_for_poison(i):
                 self.mark_as_poison(i)
                 return i
         return last_poison_index
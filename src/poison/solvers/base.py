@@ -1,8 +1,8 @@
 import abc
 import numpy as np
-from typing import Iterable, Dict
+from typing import Dict, Optional
 
-from poison.experiment import PoisonedDrinksExperiment
+from poison.experiment import PoisonedDrinksExperiment, PoisonedDrinksExperimentBatch
 
 
 class PoisonedDrinksSolver(abc.ABC):
@@ -43,6 +43,11 @@ class PoisonedDrinksSolver(abc.ABC):
     def params(self) -> Dict[str, str]:
         pass
 
+    @property
+    def supports_batch(self) -> bool:
+        """ Gets whether the solver can solve a whole batch of experiments at once. """
+        return False
+
     # endregion Properties
 
     # region Solver base functionality
@@ -50,12 +55,17 @@ class PoisonedDrinksSolver(abc.ABC):
     def load_experiment(self, experiment: PoisonedDrinksExperiment):
         self.__experiment = experiment  # Hiding the experiment so extending classes won't check for it.
         self.__num_tests = 0  # Hiding the number of tests so that extending classes won't update it.
-        self.__solution = np.zeros([self.__experiment.num_glasses])
-
-    def check_for_poison(self, glasses_indices: Iterable[int]) -> bool:
-        """ Checks if at least one of the given set of glasses is poisoned. """
+        # Reuse the solution buffer of the previous experiment when it has the same number of glasses.
+        if self.__solution is not None and len(self.__solution) == self.__experiment.num_glasses:
+            self.__solution.fill(0)
+        else:
+            self.__solution = np.zeros(self.__experiment.num_glasses, dtype=np.uint8)
+
+    def check_for_poison(self, i_start: int, i_end: Optional[int] = None) -> bool:
+        """ Checks if at least one of the glasses [i_start, i_end) is poisoned.
+            If i_end is not given, only checks the single glass i_start. """
         self.__num_tests += 1  # Keep track that a test was taken.
-        return self.__experiment.check_poison(glasses_indices)
+        return self.__experiment.check_poison(i_start, i_end)
 
     def mark_as_poison(self, glass_index: int) -> None:
         """ Marks a given glass as poisoned. """
@@ -76,4 +86,19 @@ class PoisonedDrinksSolver(abc.ABC):
         """ The implementation of the solve function of the extender class. """
         pass
 
+    def solve_batch(self, batch: PoisonedDrinksExperimentBatch) -> np.ndarray:
+        """
+        Solves all the trials of a batch of poisoned drinks problems at once.
+        Only available when supports_batch is set, in which case the extender class implements
+        _solve_batch_core(batch), returning the number of tests and the solution of each trial.
+        :param batch: The batch of experiments to solve.
+        :return: The number of tests taken in each trial.
+        """
+        if not self.supports_batch:
+            raise NotImplementedError(f"Batch solving is not supported for {self.name}.")
+        num_tests, solutions = self._solve_batch_core(batch)
+        if not np.all(batch.check_solution(solutions)):
+            raise ArithmeticError("The solution is incorrect. Fix your solver.")
+        return num_tests
+
     # endregion Solving the problem
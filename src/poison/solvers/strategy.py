@@ -1,6 +1,10 @@
+import math
+from functools import lru_cache
+
 import numpy as np
+from poison.experiment import PoisonedDrinksExperimentBatch
 from poison.solvers.base import PoisonedDrinksSolver
-from poison.stats import StatsCalculatorFactory
+from poison.stats import get_bernoulli
 
 
 def display_name(name):
@@ -11,49 +15,92 @@ def display_name(name):
     return decorator
 
 
+def batch_strategy(batch_func):
+    """ A decorator to attach to a poisoned group strategy its counterpart over a batch of experiments.
+        The counterpart scrutinizes the group [i_start, i_end) of every trial in which it is poisoned,
+        updating the number of tests and the solutions of the trials in place. """
+    def decorator(func):
+        func.batch_strategy = batch_func
+        return func
+    return decorator
+
+
 class TopGroupSizeStrategies:
     """ This class contains multiple approaches for determining the size of the top group to inspect. """
 
     @staticmethod
+    @lru_cache(maxsize=None)
     @display_name(name="YouTube")
     def youtube(n: int, p: float) -> int:
         """ Gets group size that reduce the expected number of tests according to timestamp 5:37 in the video. """
-        optimal_group_size = np.argmin([((1 - (1 - p) ** i) * n + n / i)
-                                        for i in range(1, n + 1)]) + 1
+        group_sizes = np.arange(1, n + 1)
+        optimal_group_size = int(np.argmin((1 - np.power(1 - p, group_sizes)) * n + n / group_sizes)) + 1
         return 1 if optimal_group_size >= n else optimal_group_size
 
     @staticmethod
+    @lru_cache(maxsize=None)
     @display_name(name="1/p")
     def inverse_p(n: int, p: float) -> int:
         """ Returns 1/p as the group size. """
         optimal_group_size = int(np.round(1 / p))
-        return min([optimal_group_size, n])
+        return min(optimal_group_size, n)
 
     @staticmethod
+    @lru_cache(maxsize=None)
     @display_name(name="Bernoulli trial 50%")
     def bernoulli_trial(n: int, p: float) -> int:
         """ Returns the number of tests which, according to the Bernoulli trial,
             should give you roughly 50% chance of having a poisoned glass in the group.
             More details in https://en.wikipedia.org/wiki/Bernoulli_trial. """
-        optimal_group_size = 0
-        chance_of_no_poison = 1
-        while chance_of_no_poison > 0.5:
-            optimal_group_size += 1
-            chance_of_no_poison *= (1 - p)
-        return min([optimal_group_size, n])
+        if p >= 1:
+            return 1
+        # The smallest group size k for which (1-p)^k <= 0.5.
+        optimal_group_size = math.ceil(math.log(0.5) / math.log(1 - p))
+        return min(optimal_group_size, n)
 
     @staticmethod
+    @lru_cache(maxsize=None)
     @display_name(name="min(E(#tests))")
     def minimum_total_expected_tests(n: int, p: float) -> int:
         """ Based on a full analysis of expected number of tests. """
-        bernoulli_calculator = StatsCalculatorFactory().get_bernoulli(p)
-        return max([1, bernoulli_calculator.get_group_size_statistics(n)[1]])
+        bernoulli_calculator = get_bernoulli(p)
+        return max(1, bernoulli_calculator.get_group_size_statistics(n)[1])
+
+
+def _round_robin_batch(batch: PoisonedDrinksExperimentBatch, poisoned: np.ndarray, i_start: int, i_end: int,
+                       num_tests: np.ndarray, solutions: np.ndarray):
+    """ Round-robin over the trials of a batch, where poisoned masks the trials with a poisoned group. """
+    # If the group size is 1, no need to test again - we know this glass is poisoned.
+    if i_end - i_start == 1:
+        solutions[poisoned, i_start] = 1
+    else:
+        # Else, iterate over the poisoned group elements.
+        for i in range(i_start, i_end):
+            num_tests += poisoned
+            solutions[poisoned & batch.check_poison(i), i] = 1
+
+
+def _round_robin_plus_batch(batch: PoisonedDrinksExperimentBatch, poisoned: np.ndarray, i_start: int, i_end: int,
+                            num_tests: np.ndarray, solutions: np.ndarray):
+    """ Round-robin plus over the trials of a batch, where poisoned masks the trials with a poisoned group. """
+    found_poison = np.zeros(batch.num_trials, dtype=bool)
+    for i in range(i_start, i_end):
+        tested = poisoned
+        if i == (i_end - 1):
+            # Mark the last glass as poisoned if all previous glasses were not poisoned, test it otherwise.
+            solutions[poisoned & ~found_poison, i] = 1
+            tested = poisoned & found_poison
+        num_tests += tested
+        poisoned_glass = tested & batch.check_poison(i)
+        solutions[poisoned_glass, i] = 1
+        found_poison |= poisoned_glass
 
 
 class PoisonedGroupStrategies:
 
     @staticmethod
     @display_name(name="Round-robin")
+    @batch_strategy(_round_robin_batch)
     def round_robin(solver: PoisonedDrinksSolver, i_start: int, i_end: int):
         # If the group size is 1, no need to test again - we know this glass is poisoned.
         if i_end - i_start == 1:
@@ -61,17 +108,18 @@ class PoisonedGroupStrategies:
         else:
             # Else, iterate over the poisoned group elements.
             for i in range(i_start, i_end):
-                if solver.check_for_poison([i]):
+                if solver.check_for_poison(i):
                     solver.mark_as_poison(i)
 
     @staticmethod
     @display_name(name="Round-robin plus")
+    @batch_strategy(_round_robin_plus_batch)
     def round_robin_plus(solver: PoisonedDrinksSolver, i_start: int, i_end: int):
         """ Greedy round robin marks the last glass as poisoned if all previous glasses were not poisoned. """
         # If found poison in group element, check each individual glass in the group.
         found_poison = False
         for i in range(i_start, i_end):
-            if (not found_poison and i == (i_end - 1)) or solver.check_for_poison([i]):
+            if (not found_poison and i == (i_end - 1)) or solver.check_for_poison(i):
                 solver.mark_as_poison(i)
                 found_poison = True
 
@@ -87,7 +135,7 @@ class PoisonedGroupSplitStrategies:
     @staticmethod
     @display_name(name="min(E(# tests))")
     def minimum_expected_tests_complete(i_start: int, i_end: int, p: float):
-        stats_calculator = StatsCalculatorFactory().get_bernoulli(p)
+        stats_calculator = get_bernoulli(p)
         split_delta = stats_calculator.get_poisoned_group_size_split_point(n=i_end - i_start)
         # If split_delta = 0, it means the best strategy for the group is greedy round robin, rather than splitting.
         return None if not split_delta else i_start + split_delta
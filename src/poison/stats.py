@@ -1,8 +1,7 @@
 from functools import lru_cache
-from typing import Tuple
+from typing import Dict, Tuple
 
 import numpy as np
-from poison.utils import SingletonMeta
 
 
 class BernoulliTrialCalculator:
@@ -12,7 +11,9 @@ class BernoulliTrialCalculator:
     def __init__(self, p: float):
         self.p = p
         self.max_n_searched = 0
-        self.poisoned_group_size_statistics = dict()
+        # Expected number of tests and best split point for each poisoned group size, indexed by the group size.
+        self.poisoned_group_size_expected_num_tests = np.zeros(1)
+        self.poisoned_group_size_split_points = np.zeros(1, dtype=int)
 
     # region Probability estimators.
 
@@ -32,9 +33,10 @@ class BernoulliTrialCalculator:
         return ((1-p) ** x) * self.prob_at_least_one_poison(n=n-x)
 
     def prob_at_least_one_poison_but_not_in_first_x_array(self, n: int) -> np.array:
-        return np.array([self.prob_at_least_one_poison_but_not_in_first_x(n=n, x=x) for x in range(n+1)])
+        # (1-p)^x * (1 - (1-p)^(n-x)) for every x in [0, n].
+        q = 1 - self.p
+        return np.power(q, np.arange(n+1)) - q ** n
 
-    @lru_cache(maxsize=None)
     def prob_no_poison_in_first_x_given_at_least_one_poison_array(self, n: int) -> np.array:
         return self.prob_at_least_one_poison_but_not_in_first_x_array(n=n) / self.prob_at_least_one_poison(n=n)
 
@@ -43,49 +45,58 @@ class BernoulliTrialCalculator:
     # region Expected number of tests for a poisoned group size.
 
     def compute_poisoned_group_size_statistics(self, n: int):
-        if n > self.max_n_searched:
-            for i in range(self.max_n_searched + 1, n):
-                self.poisoned_group_size_statistics[i] = self.get_poisoned_group_size_statistics(i)
-            self.max_n_searched = n
+        """ Fills the expected number of tests and best split point of every poisoned group size up to n,
+            bottom-up, so that each group size only relies on the smaller ones already computed. """
+        if n <= self.max_n_searched:
+            return
+        expected_num_tests = np.zeros(n + 1)
+        split_points = np.zeros(n + 1, dtype=int)
+        expected_num_tests[:self.max_n_searched + 1] = self.poisoned_group_size_expected_num_tests
+        split_points[:self.max_n_searched + 1] = self.poisoned_group_size_split_points
+        q_powers = np.power(1 - self.p, np.arange(n + 1))
+        # Expected number of tests of each strategy of a group: index 0 is round robin, index x is a split on x.
+        # Allocated once for the largest group, and viewed as its first k entries for a group of size k.
+        expected_number_of_tests_on_split_buffer = np.empty(n)
+        for k in range(self.max_n_searched + 1, n + 1):
+            p_start_has_no_poison = self.prob_no_poison_in_first_x_given_at_least_one_poison_array(k)
+            # Views over the split points x = 1..k-1, and the matching remaining group sizes k-x = k-1..1.
+            p_start_has_no_poison_x = p_start_has_no_poison[1:k]
+            expected_num_tests_x = expected_num_tests[1:k]
+            expected_num_tests_remaining = expected_num_tests[k - 1:0:-1]
+            q_powers_remaining = q_powers[k - 1:0:-1]
+            expected_number_of_tests_on_split = expected_number_of_tests_on_split_buffer[:k]
+            # Either we go with strategy 0 (round robin, and maybe get lucky to not test the last).
+            expected_number_of_tests_on_split[0] = \
+                p_start_has_no_poison[k - 1] * (k - 1) + (1 - p_start_has_no_poison[k - 1]) * k
+            # Or we try and split on x.
+            expected_number_of_tests_on_split[1:] = (
+                # Split on x and test the first x.
+                1 +
+                # If there isn't a poison first in the first x, continue to scrutinize the rest.
+                p_start_has_no_poison_x * expected_num_tests_remaining +
+                # If there is a poison in first in the first x.
+                (1 - p_start_has_no_poison_x) * (
+                    # We need to scrutinize the first x.
+                    expected_num_tests_x +
+                    # We have to spend another test to check if there is poison in remaining,
+                    # and if there is, we have to scrutinize the rest.
+                    1 + (1 - q_powers_remaining) * expected_num_tests_remaining))
+            # Identify the best split point which minimizes the expected number of tests.
+            split_points[k] = np.argmin(expected_number_of_tests_on_split)
+            expected_num_tests[k] = expected_number_of_tests_on_split[split_points[k]]
+        self.poisoned_group_size_expected_num_tests = expected_num_tests
+        self.poisoned_group_size_split_points = split_points
+        self.max_n_searched = n
 
     def get_poisoned_group_size_split_point(self, n: int) -> int:
-        self.compute_poisoned_group_size_statistics(n)
         return self.get_poisoned_group_size_statistics(n)[1]
 
     def get_poisoned_group_size_expected_number_of_tests(self, n: int) -> float:
-        self.compute_poisoned_group_size_statistics(n)
         return self.get_poisoned_group_size_statistics(n)[0]
 
-    @lru_cache(maxsize=None)
-    def get_poisoned_group_size_statistics(self, n) -> Tuple[float, int]:
-        p_start_has_no_poison = self.prob_no_poison_in_first_x_given_at_least_one_poison_array(n)
-        expected_number_of_tests_on_split = (
-            # Either we go with strategy 0 (round robin, and maybe get lucky to not test the last).
-            [((p_start_has_no_poison[n - 1]) * (n - 1) + (1 - p_start_has_no_poison[n - 1]) * n, 0)] +
-            # Or we try and split.
-            [(
-                (
-                    # Split on x and test the first x.
-                    1 +
-                    # If there isn't a poison first in the first x, continue to scrutinize the rest.
-                    (p_start_has_no_poison[x] * self.get_poisoned_group_size_statistics(n-x)[0]) +
-                    # If there is a poison in first in the first x.
-                    ((1 - p_start_has_no_poison[x]) * (
-                        # We need to scrutinize the first x.
-                        self.get_poisoned_group_size_statistics(x)[0] +
-                        # We have to spend another test to check if there is poison in remaining.
-                        1 + (
-                            # If there wasn't, we're in luck. No need to test further.
-                            (1 - self.prob_at_least_one_poison(n-x)) * 0 +
-                            # Otherwise, we have to scrutinize the rest.
-                            (self.prob_at_least_one_poison(n-x)) * (self.get_poisoned_group_size_statistics(n-x)[0])
-                        )
-                    ))
-                ),
-             x) for x in range(1, n)])
-        # Identify the best split point which minimizes the expected number of tests.
-        optimal_strategy = expected_number_of_tests_on_split[np.argmin(expected_number_of_tests_on_split, axis=0)[0]]
-        return optimal_strategy
+    def get_poisoned_group_size_statistics(self, n: int) -> Tuple[float, int]:
+        self.compute_poisoned_group_size_statistics(n)
+        return self.poisoned_group_size_expected_num_tests[n], int(self.poisoned_group_size_split_points[n])
 
     # endregion Calculate expected number of tests for a group size.
 
@@ -93,36 +104,31 @@ class BernoulliTrialCalculator:
 
     def get_group_size_statistics(self, n: int) -> Tuple[float, int]:
         self.compute_poisoned_group_size_statistics(n)
-        expected_num_tests = [(
-                # Testing each group size, and if found poison, scrutinize based on our best strategy.
-                np.floor(n / group_size) * (
-                        1
-                        + (self.prob_at_least_one_poison(n=group_size) *
-                           self.get_poisoned_group_size_expected_number_of_tests(n=group_size)))
-                # If the last group is smaller than n.
-                + (0.0 if not n % group_size
-                    else (1 + (self.prob_at_least_one_poison(n=n % group_size) *
-                               self.get_poisoned_group_size_expected_number_of_tests(n=(n % group_size))))),
-                group_size)
-            for group_size in range(1, n+1)]
-        minimal_expected_num_tests = expected_num_tests[np.argmin(expected_num_tests, axis=0)[0]]
-        return minimal_expected_num_tests
+        group_sizes = np.arange(1, n + 1)
+        remainders = n % group_sizes
+        q = 1 - self.p
+        expected_num_tests = self.poisoned_group_size_expected_num_tests
+        total_expected_num_tests = (
+            # Testing each group size, and if found poison, scrutinize based on our best strategy.
+            (n // group_sizes) * (1 + (1 - np.power(q, group_sizes)) * expected_num_tests[group_sizes])
+            # If the last group is smaller than n.
+            + np.where(remainders > 0, 1 + (1 - np.power(q, remainders)) * expected_num_tests[remainders], 0.0))
+        optimal_index = int(np.argmin(total_expected_num_tests))
+        return float(total_expected_num_tests[optimal_index]), int(group_sizes[optimal_index])
 
     # endregion Expected number of tests for a top-level group size.
 
 
-class StatsCalculatorFactory(metaclass=SingletonMeta):
-    """ A factory class used to build calculators. """
+# Bernoulli trial calculators, one per poison probability, shared by all strategies.
+_bernoulli_calculators: Dict[float, BernoulliTrialCalculator] = dict()
 
-    def __init__(self):
-        self._bernoulli_calculators = dict()
 
-    def get_bernoulli(self, p: float) -> BernoulliTrialCalculator:
-        """
-        Gets a Bernoulli trial poisoned drinks calculator for the given probability.
-        :param p: The probability calculator.
-        :return: The statistical calculator.
-        """
-        if p not in self._bernoulli_calculators:
-            self._bernoulli_calculators[p] = BernoulliTrialCalculator(p=p)
-        return self._bernoulli_calculators[p]
+def get_bernoulli(p: float) -> BernoulliTrialCalculator:
+    """
+    Gets a Bernoulli trial poisoned drinks calculator for the given probability.
+    :param p: The probability calculator.
+    :return: The statistical calculator.
+    """
+    if p not in _bernoulli_calculators:
+        _bernoulli_calculators[p] = BernoulliTrialCalculator(p=p)
+    return _bernoulli_calculators[p]